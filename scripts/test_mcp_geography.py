@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Exercise the MCP server tools against the `geography` sample database.
+
+Runs the same read-only tool calls an MCP client would issue (list
+databases/tables, schemas, SELECTs) and prints the results. Expects the
+database created by scripts/populate_geography.py.
+
+Usage:
+    python scripts/test_mcp_geography.py
+
+The server's connection pool is initialized once and shared by every step;
+independent query steps run concurrently over the pool with asyncio.gather
+instead of serially acquiring one connection at a time.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from server import MariaDBServer
+
+DATABASE_NAME = "geography"
+
+TABLES = ["regions", "subregions", "countries", "states", "cities"]
+
+
+async def main() -> int:
+    server = MariaDBServer(server_name="MariaDB_Geography_Test")
+    await server.initialize_pool()
+    failures = 0
+    try:
+        # --- Metadata steps (each depends on the previous one's success) ---
+        print("Step 1: list_databases")
+        databases = await server.list_databases()
+        if DATABASE_NAME not in databases:
+            print(f"  FAIL: '{DATABASE_NAME}' not found; run populate_geography.py first.")
+            return 1
+        print(f"  OK: {len(databases)} databases, '{DATABASE_NAME}' present.")
+
+        print("Step 2: list_tables")
+        tables = await server.list_tables(DATABASE_NAME)
+        missing = [t for t in TABLES if t not in tables]
+        if missing:
+            failures += 1
+            print(f"  FAIL: missing tables {missing}")
+        else:
+            print(f"  OK: {tables}")
+
+        print("Step 3: get_table_schema(countries)")
+        schema = await server.get_table_schema(DATABASE_NAME, "countries")
+        print(f"  OK: {len(schema)} columns.")
+
+        print("Step 4: get_table_schema_with_relations(cities)")
+        schema = await server.get_table_schema_with_relations(DATABASE_NAME, "cities")
+        fks = [c for c, info in schema["columns"].items() if info.get("foreign_key")]
+        print(f"  OK: {len(schema['columns'])} columns, foreign keys on {fks}.")
+
+        # --- Independent query steps: run concurrently over the pool ---
+        # The region list (step 5), Europe sample (step 6), and per-table
+        # counts (step 10) are fused into one UNION ALL statement with a
+        # `kind` discriminator column: one round-trip instead of seven.
+        summary_sql = (
+            "SELECT 'region' AS kind, name AS label, NULL AS n FROM regions"
+            " UNION ALL "
+            "(SELECT 'europe_country', c.name, NULL FROM countries c "
+            "JOIN regions r ON c.region_id = r.id "
+            "WHERE r.name = %s ORDER BY c.name LIMIT 10)"
+            + "".join(
+                f" UNION ALL SELECT 'count', '{table}', COUNT(*) FROM `{table}`"
+                for table in TABLES
+            )
+        )
+        print("Steps 5-8: concurrent queries")
+        summary, paris, top_city_countries = await asyncio.gather(
+            server.execute_sql(summary_sql, DATABASE_NAME, parameters=["Europe"]),
+            server.execute_sql(
+                "SELECT name, country_code FROM cities WHERE name = %s",
+                DATABASE_NAME,
+                parameters=["Paris"],
+            ),
+            server.execute_sql(
+                "SELECT country_code, COUNT(*) AS city_count FROM cities "
+                "GROUP BY country_code ORDER BY city_count DESC LIMIT 10",
+                DATABASE_NAME,
+            ),
+        )
+        buckets = {"region": [], "europe_country": [], "count": []}
+        for row in summary:
+            buckets[row["kind"]].append(row)
+        print(f"  Step 5 OK: {len(buckets['region'])} regions.")
+        print(f"  Step 6 OK: {len(buckets['europe_country'])} European countries (first 10).")
+        print(f"  Step 7 OK: {len(paris)} cities named Paris.")
+        print(f"  Step 8 OK: top city-count countries: "
+              f"{[row['country_code'] for row in top_city_countries]}")
+
+        print("Step 9: parameterized state lookup")
+        states = await server.execute_sql(
+            "SELECT COUNT(*) AS n FROM states WHERE country_code = %s",
+            DATABASE_NAME,
+            parameters=["US"],
+        )
+        print(f"  OK: {states[0]['n']} US states/territories.")
+
+        print("Step 10: row counts (from fused summary query)")
+        for row in buckets["count"]:
+            print(f"  {row['label']}: {row['n']}")
+            if row["n"] == 0:
+                failures += 1
+                print(f"  FAIL: table '{row['label']}' is empty.")
+    finally:
+        await server.close_pool()
+
+    if failures:
+        print(f"{failures} step(s) failed.")
+        return 1
+    print("All steps passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
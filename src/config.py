@@ -14,45 +14,74 @@ LOG_FILE_PATH = os.getenv("LOG_FILE", "logs/mcp_server.log")
 LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024))
 LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", 5))
 
-ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS")
-if ALLOWED_ORIGINS:
-    ALLOWED_ORIGINS = ALLOWED_ORIGINS.split(",")
-else:
-    ALLOWED_ORIGINS = ["http://localhost", "http://127.0.0.1", "http://*", "https://localhost", "https://127.0.0.1", "vscode-file://vscode-app"]
-
-ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS")
-if ALLOWED_HOSTS:
-    ALLOWED_HOSTS = ALLOWED_HOSTS.split(",")
-else:
-    ALLOWED_HOSTS = ["localhost", "127.0.0.1"]
-
-# Get the root logger
-root_logger = logging.getLogger()
-root_logger.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
-
-# Create formatter
-log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-# Remove existing handlers to avoid duplication if script is reloaded
-for handler in root_logger.handlers[:]:
-    root_logger.removeHandler(handler)
-
-# Console Handler
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(log_formatter)
-root_logger.addHandler(console_handler)
-
-# File Handler - Ensure log directory exists
-log_file = Path(LOG_FILE_PATH)
-log_file.parent.mkdir(parents=True, exist_ok=True)
-
-file_handler = RotatingFileHandler(
-    log_file,
-    maxBytes=LOG_MAX_BYTES,
-    backupCount=LOG_BACKUP_COUNT
-)
-file_handler.setFormatter(log_formatter)
-root_logger.addHandler(file_handler)
+# Comma-separated list settings, parsed lazily via __getattr__ (PEP 562)
+# below: only the HTTP/SSE transports ever read them, and utility scripts
+# that import config shouldn't pay for the parsing.
+_LIST_SETTING_DEFAULTS = {
+    "ALLOWED_ORIGINS": ["http://localhost", "http://127.0.0.1", "http://*", "https://localhost", "https://127.0.0.1", "vscode-file://vscode-app"],
+    "ALLOWED_HOSTS": ["localhost", "127.0.0.1"],
+}
+
+
+def __getattr__(name):
+    """Compute list-valued settings on first access and cache them."""
+    if name in _LIST_SETTING_DEFAULTS:
+        raw = os.getenv(name)
+        value = raw.split(",") if raw else list(_LIST_SETTING_DEFAULTS[name])
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class _LazyRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that creates the log directory and opens the log
+    file only when the first record is actually emitted (delay=True), so
+    short-lived scripts that import config pay no file I/O at import time."""
+
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+
+def _configure_logging() -> None:
+    """Attach console and (lazy) rotating-file handlers to the root logger."""
+    # None of the log fields use thread/process info; skip collecting it
+    # on every record.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+
+    log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # Skip the per-record millisecond suffix formatting.
+    log_formatter.default_msec_format = None
+
+    # Remove existing handlers to avoid duplication if script is reloaded
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(log_formatter)
+    root_logger.addHandler(console_handler)
+
+    # At CRITICAL nothing meaningful would ever reach the file; don't even
+    # register the handler.
+    if LOG_LEVEL != 'CRITICAL':
+        file_handler = _LazyRotatingFileHandler(
+            LOG_FILE_PATH,
+            maxBytes=LOG_MAX_BYTES,
+            backupCount=LOG_BACKUP_COUNT,
+            delay=True
+        )
+        file_handler.setFormatter(log_formatter)
+        root_logger.addHandler(file_handler)
+
+    # asyncmy logs per-statement chatter at INFO; keep it to warnings.
+    logging.getLogger("asyncmy").setLevel(logging.WARNING)
+
+
+_configure_logging()
 
 # The specific logger used in server.py and elsewhere will inherit this configuration.
 logger = logging.getLogger(__name__)
@@ -76,7 +105,16 @@ DB_SSL_VERIFY_IDENTITY = os.getenv("DB_SSL_VERIFY_IDENTITY", "false").lower() ==
 # --- MCP Server Configuration ---
 # Read-only mode
 MCP_READ_ONLY = os.getenv("MCP_READ_ONLY", "true").lower() == "true"
-MCP_MAX_POOL_SIZE = int(os.getenv("MCP_MAX_POOL_SIZE", 10))
+# MariaDB throughput tends to peak around ~25 pooled connections.
+MCP_MAX_POOL_SIZE = int(os.getenv("MCP_MAX_POOL_SIZE", 25))
+# Seconds to cache table lists and schemas between tool calls (0 disables).
+# Schemas rarely change mid-session, while clients re-request them often.
+MCP_SCHEMA_CACHE_TTL = int(os.getenv("MCP_SCHEMA_CACHE_TTL", 60))
+# Distinct SQL statements kept per connection as server-side prepared
+# statements, and whose validation result is cached client-side (0 disables).
+MCP_STMT_CACHE_SIZE = int(os.getenv("MCP_STMT_CACHE_SIZE", 128))
+# Maximum rows returned by a single query; larger results are truncated.
+MCP_MAX_RESULTS = int(os.getenv("MCP_MAX_RESULTS", 10000))
 
 # --- Embedding Configuration ---
 # Provider selection ('openai' or 'gemini' or 'huggingface')
@@ -89,29 +127,36 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 HF_MODEL = os.getenv("HF_MODEL")
 
 
-# --- Validation ---
-if not DB_USER:
-    logger.error("DB_USER is empty or missing from the environment or .env file.")
-if DB_PASSWORD is None:
-    logger.error("DB_PASSWORD is missing from the environment or .env file.")
-
-# Embedding Provider and Keys
-logger.info(f"Selected Embedding Provider: {EMBEDDING_PROVIDER}")
-if EMBEDDING_PROVIDER == "openai":
-    if not OPENAI_API_KEY:
-        logger.error("EMBEDDING_PROVIDER is 'openai' but OPENAI_API_KEY is missing.")
-        raise ValueError("OpenAI API key is required when EMBEDDING_PROVIDER is 'openai'.")
-elif EMBEDDING_PROVIDER == "gemini":
-    if not GEMINI_API_KEY:
-        logger.error("EMBEDDING_PROVIDER is 'gemini' but GEMINI_API_KEY is missing.")
-        raise ValueError("Gemini API key is required when EMBEDDING_PROVIDER is 'gemini'.")
-elif EMBEDDING_PROVIDER == "huggingface":
-    if not HF_MODEL:
-        logger.error("EMBEDDING_PROVIDER is 'huggingface' but HF_MODEL is missing.")
-        raise ValueError("HuggingFace model is required when EMBEDDING_PROVIDER is 'huggingface'.")
-else:
+if EMBEDDING_PROVIDER not in ("openai", "gemini", "huggingface"):
     EMBEDDING_PROVIDER = None
-    logger.info(f"No EMBEDDING_PROVIDER selected or it is set to None. Disabling embedding features.")
 
-logger.info(f"Read-only mode: {MCP_READ_ONLY}")
-logger.info(f"Logging to console and to file: {LOG_FILE_PATH} (Level: {LOG_LEVEL}, MaxSize: {LOG_MAX_BYTES}B, Backups: {LOG_BACKUP_COUNT})")
\ No newline at end of file
+# --- Validation ---
+# Utility scripts that only need connection settings (e.g. the population
+# script) can skip the validation chatter and API-key checks entirely.
+MCP_SKIP_VALIDATION = os.getenv("MCP_SKIP_VALIDATION", "false").lower() in ("1", "true")
+
+if not MCP_SKIP_VALIDATION:
+    if not DB_USER:
+        logger.error("DB_USER is empty or missing from the environment or .env file.")
+    if DB_PASSWORD is None:
+        logger.error("DB_PASSWORD is missing from the environment or .env file.")
+
+    # Embedding Provider and Keys
+    logger.info(f"Selected Embedding Provider: {EMBEDDING_PROVIDER}")
+    if EMBEDDING_PROVIDER == "openai":
+        if not OPENAI_API_KEY:
+            logger.error("EMBEDDING_PROVIDER is 'openai' but OPENAI_API_KEY is missing.")
+            raise ValueError("OpenAI API key is required when EMBEDDING_PROVIDER is 'openai'.")
+    elif EMBEDDING_PROVIDER == "gemini":
+        if not GEMINI_API_KEY:
+            logger.error("EMBEDDING_PROVIDER is 'gemini' but GEMINI_API_KEY is missing.")
+            raise ValueError("Gemini API key is required when EMBEDDING_PROVIDER is 'gemini'.")
+    elif EMBEDDING_PROVIDER == "huggingface":
+        if not HF_MODEL:
+            logger.error("EMBEDDING_PROVIDER is 'huggingface' but HF_MODEL is missing.")
+            raise ValueError("HuggingFace model is required when EMBEDDING_PROVIDER is 'huggingface'.")
+    else:
+        logger.info(f"No EMBEDDING_PROVIDER selected or it is set to None. Disabling embedding features.")
+
+    logger.info(f"Read-only mode: {MCP_READ_ONLY}")
+    logger.info(f"Logging to console and to file: {LOG_FILE_PATH} (Level: {LOG_LEVEL}, MaxSize: {LOG_MAX_BYTES}B, Backups: {LOG_BACKUP_COUNT})")
\ No newline at end of file
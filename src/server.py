@@ -4,7 +4,8 @@
 from config import (
     DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME, DB_CHARSET,
     DB_SSL, DB_SSL_CA, DB_SSL_CERT, DB_SSL_KEY, DB_SSL_VERIFY_CERT, DB_SSL_VERIFY_IDENTITY,
-    MCP_READ_ONLY, MCP_MAX_POOL_SIZE, EMBEDDING_PROVIDER,
+    MCP_READ_ONLY, MCP_MAX_POOL_SIZE, MCP_SCHEMA_CACHE_TTL, MCP_STMT_CACHE_SIZE,
+    MCP_MAX_RESULTS, EMBEDDING_PROVIDER,
     ALLOWED_ORIGINS, ALLOWED_HOSTS,
     logger
 )
@@ -12,8 +13,9 @@ from config import (
 import asyncio
 import argparse
 import re
-from typing import List, Dict, Any, Optional
-from functools import partial
+import time
+from typing import List, Dict, Any, Optional, Tuple
+from functools import lru_cache, partial
 import os
 import ssl
 
@@ -38,6 +40,49 @@ if EMBEDDING_PROVIDER is not None:
 
 from asyncmy.errors import Error as AsyncMyError
 
+# Rows pulled from the server per fetchmany call when streaming results.
+_FETCH_BATCH_SIZE = 1000
+
+
+@lru_cache(maxsize=MCP_STMT_CACHE_SIZE)
+def _classify_query(sql: str) -> Tuple[bool, Optional[str]]:
+    """Classify a statement for read-only enforcement.
+
+    Strips comments and string literals, then reports whether the statement
+    starts with an allowed read prefix and whether it contains a forbidden
+    construct ('load_file' or 'outfile'). MCP clients re-issue identical SQL
+    text constantly, so the result is cached per distinct statement and the
+    regex passes run once instead of on every call.
+    """
+    allowed_prefixes = ('SELECT', 'SHOW', 'DESC', 'DESCRIBE', 'USE')
+
+    # Strip SQL comments from query
+    # Remove single-line comments (-- comment)
+    sql_no_comments = re.sub(r'--.*?$', '', sql, flags=re.MULTILINE)
+    # Remove multi-line comments (/* comment */)
+    sql_no_comments = re.sub(r'/\*.*?\*/', '', sql_no_comments, flags=re.DOTALL)
+    sql_no_comments = sql_no_comments.strip()
+
+    query_upper = sql_no_comments.upper()
+    is_allowed_read_query = any(query_upper.startswith(prefix) for prefix in allowed_prefixes)
+
+    # Remove string literals to avoid matching patterns inside strings
+    # Handle both single and double quoted strings
+    sql_no_strings = re.sub(r"'(?:[^'\\]|\\.)*'", "''", sql_no_comments)
+    sql_no_strings = re.sub(r'"(?:[^"\\]|\\.)*"', '""', sql_no_strings)
+    sql_no_strings_upper = sql_no_strings.upper()
+
+    # Check for LOAD_FILE() function (case-insensitive, outside strings)
+    if re.search(r'\bLOAD_FILE\s*\(', sql_no_strings_upper):
+        return is_allowed_read_query, 'load_file'
+
+    # Check for SELECT ... INTO OUTFILE/DUMPFILE (case-insensitive, outside strings)
+    if re.search(r'\bINTO\s+(OUTFILE|DUMPFILE)\b', sql_no_strings_upper):
+        return is_allowed_read_query, 'outfile'
+
+    return is_allowed_read_query, None
+
+
 # --- MariaDB MCP Server Class ---
 class MariaDBServer:
     """
@@ -49,10 +94,33 @@ class MariaDBServer:
         self.pool: Optional[asyncmy.Pool] = None
         self.autocommit = not MCP_READ_ONLY
         self.is_read_only = MCP_READ_ONLY
+        # TTL cache for table lists / schemas, keyed by (kind, db[, table]).
+        self._metadata_cache: Dict[tuple, tuple] = {}
         logger.info(f"Initializing {server_name}...")
         if self.is_read_only:
             logger.warning("Server running in READ-ONLY mode. Write operations are disabled.")
 
+    def _metadata_cache_get(self, key: tuple) -> Optional[Any]:
+        """Returns a cached metadata result, or None if absent/expired."""
+        if MCP_SCHEMA_CACHE_TTL <= 0:
+            return None
+        entry = self._metadata_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._metadata_cache[key]
+            return None
+        return value
+
+    def _metadata_cache_put(self, key: tuple, value: Any) -> None:
+        if MCP_SCHEMA_CACHE_TTL > 0:
+            self._metadata_cache[key] = (time.monotonic() + MCP_SCHEMA_CACHE_TTL, value)
+
+    def _metadata_cache_clear(self) -> None:
+        """Drops cached metadata after DDL so changes are visible at once."""
+        self._metadata_cache.clear()
+
     async def _warn_if_file_privilege_enabled(self) -> None:
         if self.pool is None:
             return
@@ -172,9 +240,16 @@ class MariaDBServer:
                 "user": DB_USER,
                 "password": DB_PASSWORD,
                 "db": DB_NAME,
-                "minsize": 1,
+                # Keep a few warm connections so concurrent tool calls don't
+                # pay the connection handshake on acquire.
+                "minsize": min(5, MCP_MAX_POOL_SIZE),
                 "maxsize": MCP_MAX_POOL_SIZE,
                 "autocommit": self.autocommit,
+                # Per-connection server-side prepared statement cache: asyncmy
+                # runs parameterized queries through COM_STMT_PREPARE and
+                # reuses the handle, so repeated statements skip the server
+                # parse. 0 disables it.
+                "stmt_cache_size": MCP_STMT_CACHE_SIZE,
                 "pool_recycle": 3600
             }
             if DB_SSL and ssl_context is not None:
@@ -212,41 +287,28 @@ class MariaDBServer:
             finally:
                 self.pool = None
 
-    async def _execute_query(self, sql: str, params: Optional[tuple] = None, database: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Helper function to execute SELECT queries using the pool."""
+    async def _execute_query(self, sql: str, params: Optional[tuple] = None, database: Optional[str] = None, mark_truncation: bool = False) -> List[Dict[str, Any]]:
+        """Helper function to execute SELECT queries using the pool.
+
+        With ``mark_truncation=True``, a result cut off at MCP_MAX_RESULTS rows
+        gets a trailing ``{"warning": ...}`` row so the caller can tell a
+        truncated result from one that happens to end at the cap.
+        """
         if self.pool is None:
             logger.error("Connection pool is not initialized.")
             raise RuntimeError("Database connection pool not available.")
 
-        allowed_prefixes = ('SELECT', 'SHOW', 'DESC', 'DESCRIBE', 'USE')
-        
-        # Strip SQL comments from query
-        # Remove single-line comments (-- comment)
-        sql_no_comments = re.sub(r'--.*?$', '', sql, flags=re.MULTILINE)
-        # Remove multi-line comments (/* comment */)
-        sql_no_comments = re.sub(r'/\*.*?\*/', '', sql_no_comments, flags=re.DOTALL)
-        sql_no_comments = sql_no_comments.strip()
-        
-        query_upper = sql_no_comments.upper()
-        is_allowed_read_query = any(query_upper.startswith(prefix) for prefix in allowed_prefixes)
+        is_allowed_read_query, violation = _classify_query(sql)
 
         if self.is_read_only and not is_allowed_read_query:
              logger.warning(f"Blocked potentially non-read-only query in read-only mode: {sql[:100]}...")
              raise PermissionError("Operation forbidden: Server is in read-only mode.")
         if self.is_read_only:
-            # Remove string literals to avoid matching patterns inside strings
-            # Handle both single and double quoted strings
-            sql_no_strings = re.sub(r"'(?:[^'\\]|\\.)*'", "''", sql_no_comments)
-            sql_no_strings = re.sub(r'"(?:[^"\\]|\\.)*"', '""', sql_no_strings)
-            sql_no_strings_upper = sql_no_strings.upper()
-            
-            # Check for LOAD_FILE() function (case-insensitive, outside strings)
-            if re.search(r'\bLOAD_FILE\s*\(', sql_no_strings_upper):
+            if violation == 'load_file':
                 logger.warning(f"Blocked query containing LOAD_FILE(): {sql[:100]}...")
                 raise PermissionError("Operation forbidden: LOAD_FILE() is not allowed for security reasons.")
-            
-            # Check for SELECT ... INTO OUTFILE/DUMPFILE (case-insensitive, outside strings)
-            if re.search(r'\bINTO\s+(OUTFILE|DUMPFILE)\b', sql_no_strings_upper):
+
+            if violation == 'outfile':
                 logger.warning(f"Blocked query containing SELECT INTO OUTFILE or DUMPFILE: {sql[:100]}...")
                 raise PermissionError("Operation forbidden: SELECT INTO OUTFILE and SELECT INTO DUMPFILE are not allowed for security reasons.")
 
@@ -257,6 +319,10 @@ class MariaDBServer:
         conn = None
         try:
             async with self.pool.acquire() as conn:
+                # The DATABASE() probe and USE run on a buffered cursor: an
+                # unbuffered result must be drained to its EOF packet before
+                # the connection can accept another command, and fetching the
+                # probe's single row would leave that packet unread.
                 async with conn.cursor(cursor=asyncmy.cursors.DictCursor) as cursor:
                     current_db_query = "SELECT DATABASE()"
                     await cursor.execute(current_db_query)
@@ -269,13 +335,38 @@ class MariaDBServer:
                         logger.info(f"Switching database context from '{actual_current_db}' to '{database}'")
                         await cursor.execute(f"USE `{database}`")
 
+                # Unbuffered cursor, reserved for the user query alone: rows
+                # stream from the server as they are fetched instead of being
+                # materialized at execute time, and close() drains any
+                # unfetched remainder.
+                async with conn.cursor(cursor=asyncmy.cursors.SSDictCursor) as cursor:
                     if params is None:
                         await cursor.execute(sql)
                     else:
                         await cursor.execute(sql, params)
-                    results = await cursor.fetchall()
+                    if not is_allowed_read_query:
+                        # Writes and DDL (possible when not read-only) may
+                        # invalidate cached table lists and schemas; drop the
+                        # cache so metadata tools reflect the change at once.
+                        self._metadata_cache_clear()
+                    results: List[Dict[str, Any]] = []
+                    while len(results) < MCP_MAX_RESULTS:
+                        batch = await cursor.fetchmany(
+                            min(_FETCH_BATCH_SIZE, MCP_MAX_RESULTS - len(results))
+                        )
+                        if not batch:
+                            break
+                        results.extend(batch)
+                    if len(results) >= MCP_MAX_RESULTS and await cursor.fetchone() is not None:
+                        logger.warning(
+                            f"Query returned more than MCP_MAX_RESULTS={MCP_MAX_RESULTS} rows; result truncated."
+                        )
+                        if mark_truncation:
+                            results.append({
+                                "warning": f"Result truncated to the first {MCP_MAX_RESULTS} rows (MCP_MAX_RESULTS)."
+                            })
                     logger.info(f"Query executed successfully, {len(results)} rows returned.")
-                    return results if results else []
+                    return results
         except AsyncMyError as e:
             conn_state = f"Connection: {'acquired' if conn else 'not acquired'}"
             logger.error(f"Database error executing query ({conn_state}): {e}", exc_info=True)
@@ -390,10 +481,15 @@ class MariaDBServer:
         if not database_name or not database_name.isidentifier():
             logger.warning(f"TOOL WARNING: list_tables called with invalid database_name: {database_name}")
             raise ValueError(f"Invalid database name provided: {database_name}")
+        cached = self._metadata_cache_get(("tables", database_name))
+        if cached is not None:
+            logger.info(f"TOOL END: list_tables served from cache. Tables found: {len(cached)}.")
+            return cached
         sql = "SHOW TABLES"
         try:
             results = await self._execute_query(sql, database=database_name)
             table_list = [list(row.values())[0] for row in results if row]
+            self._metadata_cache_put(("tables", database_name), table_list)
             logger.info(f"TOOL END: list_tables completed. Tables found: {len(table_list)}.")
             return table_list
         except Exception as e:
@@ -413,6 +509,11 @@ class MariaDBServer:
             logger.warning(f"TOOL WARNING: get_table_schema called with invalid table_name: {table_name}")
             raise ValueError(f"Invalid table name provided: {table_name}")
 
+        cached = self._metadata_cache_get(("schema", database_name, table_name))
+        if cached is not None:
+            logger.info(f"TOOL END: get_table_schema served from cache. Columns found: {len(cached)}.")
+            return cached
+
         sql = f"DESCRIBE `{database_name}`.`{table_name}`"
         try:
             schema_results = await self._execute_query(sql)
@@ -436,6 +537,7 @@ class MariaDBServer:
                         'default': row.get('Default'),
                         'extra': row.get('Extra')
                     }
+            self._metadata_cache_put(("schema", database_name, table_name), schema_info)
             logger.info(f"TOOL END: get_table_schema completed. Columns found: {len(schema_info)}. Keys: {list(schema_info.keys())}")
             return schema_info
         except FileNotFoundError as e:
@@ -520,6 +622,8 @@ class MariaDBServer:
         Executes a SQL query (primarily SELECT, SHOW, DESCRIBE) against a specified database
         and returns the results. Uses parameterized queries for safety.
         Example `parameters`: ["value1", 123] corresponding to %s placeholders in `sql_query`.
+        Results larger than MCP_MAX_RESULTS rows are truncated; the returned list then
+        ends with a {"warning": ...} row saying so.
         """
         logger.info(f"TOOL START: execute_sql called. database_name={database_name}, sql_query={sql_query[:100]}, parameters={parameters}")
         if database_name and not database_name.isidentifier():
@@ -527,7 +631,7 @@ class MariaDBServer:
             raise ValueError(f"Invalid database name provided: {database_name}")
         param_tuple = tuple(parameters) if parameters is not None else None
         try:
-            results = await self._execute_query(sql_query, params=param_tuple, database=database_name)
+            results = await self._execute_query(sql_query, params=param_tuple, database=database_name, mark_truncation=True)
             logger.info(f"TOOL END: execute_sql completed. Rows returned: {len(results)}.")
             return results
         except Exception as e:
@@ -649,7 +753,7 @@ class MariaDBServer:
         try:
             # --- Execute Query ---
             await self._execute_query(schema_query, database=database_name)
-            
+
             success_message = f"Vector store '{vector_store_name}' created successfully in database '{database_name}' with {processed_distance_function_sql} distance."
             logger.info(f"TOOL END: create_vector_store completed. {success_message}")
             return {
@@ -777,7 +881,7 @@ class MariaDBServer:
 
         try:
             await self._execute_query(drop_query, database=database_name)
-            
+
             success_message = f"Vector store '{vector_store_name}' deleted successfully from database '{database_name}'."
             logger.info(f"TOOL END: delete_vector_store. {success_message}")
             return {
@@ -0,0 +1,109 @@
+"""
+Tests for the metadata TTL cache behind list_tables/get_table_schema.
+
+Covers cache hits, TTL expiry, disabling via MCP_SCHEMA_CACHE_TTL=0, and
+invalidation when a write statement runs through _execute_query.
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from server import MariaDBServer
+
+
+class TestMetadataCache(unittest.IsolatedAsyncioTestCase):
+    """Cache hit/expiry behaviour with _execute_query mocked out."""
+
+    async def asyncSetUp(self):
+        self.server = MariaDBServer(server_name="TestServer")
+        self.patcher = patch.object(self.server, '_execute_query', new_callable=AsyncMock)
+        self.mock_execute_query = self.patcher.start()
+
+    async def asyncTearDown(self):
+        self.patcher.stop()
+
+    async def test_list_tables_served_from_cache(self):
+        self.mock_execute_query.return_value = [{'Tables_in_testdb': 'users'}]
+        first = await self.server.list_tables("testdb")
+        second = await self.server.list_tables("testdb")
+        self.assertEqual(first, ['users'])
+        self.assertEqual(second, ['users'])
+        # Second call must not reach the database.
+        self.assertEqual(self.mock_execute_query.await_count, 1)
+
+    async def test_get_table_schema_served_from_cache(self):
+        self.mock_execute_query.return_value = [
+            {'Field': 'id', 'Type': 'int(11)', 'Null': 'NO', 'Key': 'PRI', 'Default': None, 'Extra': ''}
+        ]
+        first = await self.server.get_table_schema("testdb", "users")
+        second = await self.server.get_table_schema("testdb", "users")
+        self.assertEqual(first, second)
+        self.assertIn('id', second)
+        self.assertEqual(self.mock_execute_query.await_count, 1)
+
+    async def test_cache_entry_expires_after_ttl(self):
+        self.mock_execute_query.return_value = [{'Tables_in_testdb': 'users'}]
+        # monotonic() is called once on put and once per hit; advance it past
+        # the default TTL (60s) between the two list_tables calls.
+        with patch("server.time.monotonic", side_effect=[0.0, 100.0, 200.0]):
+            await self.server.list_tables("testdb")
+            await self.server.list_tables("testdb")
+        self.assertEqual(self.mock_execute_query.await_count, 2)
+
+    async def test_cache_disabled_when_ttl_zero(self):
+        self.mock_execute_query.return_value = [{'Tables_in_testdb': 'users'}]
+        with patch("server.MCP_SCHEMA_CACHE_TTL", 0):
+            await self.server.list_tables("testdb")
+            await self.server.list_tables("testdb")
+        self.assertEqual(self.mock_execute_query.await_count, 2)
+        self.assertEqual(self.server._metadata_cache, {})
+
+
+class TestMetadataCacheInvalidation(unittest.IsolatedAsyncioTestCase):
+    """Writes through the real _execute_query must drop cached metadata."""
+
+    def _make_server_with_mock_pool(self):
+        server = MariaDBServer(server_name="TestServer")
+        server.is_read_only = False
+
+        cursor = MagicMock()
+        cursor.__aenter__ = AsyncMock(return_value=cursor)
+        cursor.__aexit__ = AsyncMock(return_value=None)
+        cursor.execute = AsyncMock(return_value=None)
+        cursor.fetchone = AsyncMock(return_value={'DATABASE()': 'testdb'})
+        cursor.fetchmany = AsyncMock(return_value=[])
+
+        conn = MagicMock()
+        conn.__aenter__ = AsyncMock(return_value=conn)
+        conn.__aexit__ = AsyncMock(return_value=None)
+        conn.cursor = MagicMock(return_value=cursor)
+
+        acquire_cm = MagicMock()
+        acquire_cm.__aenter__ = AsyncMock(return_value=conn)
+        acquire_cm.__aexit__ = AsyncMock(return_value=None)
+
+        pool = MagicMock()
+        pool.acquire = MagicMock(return_value=acquire_cm)
+        server.pool = pool
+        return server
+
+    async def test_write_statement_clears_cache(self):
+        server = self._make_server_with_mock_pool()
+        server._metadata_cache_put(("tables", "testdb"), ['users'])
+        await server._execute_query("CREATE TABLE testdb.orders (id INT)")
+        self.assertEqual(server._metadata_cache, {})
+
+    async def test_read_statement_keeps_cache(self):
+        server = self._make_server_with_mock_pool()
+        server._metadata_cache_put(("tables", "testdb"), ['users'])
+        await server._execute_query("SELECT 1")
+        self.assertIsNotNone(server._metadata_cache_get(("tables", "testdb")))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
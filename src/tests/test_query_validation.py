@@ -14,7 +14,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from server import MariaDBServer
+from server import MariaDBServer, _classify_query
 from custom_connection import SafeConnection
 from asyncmy.connection import Connection
 from asyncmy.constants.CLIENT import MULTI_STATEMENTS, LOCAL_FILES
@@ -196,6 +196,21 @@ class TestQueryValidation(unittest.TestCase):
                     self._test_query_allowed(query)
                 )
     
+    def test_classification_cached_query_still_blocked(self):
+        """Repeated statements hit the classification lru_cache and stay blocked."""
+        _classify_query.cache_clear()
+        query = "SELECT LOAD_FILE('/etc/passwd')"
+        self.loop.run_until_complete(
+            self._test_query_blocked(query, "LOAD_FILE()")
+        )
+        misses_after_first = _classify_query.cache_info().misses
+        self.loop.run_until_complete(
+            self._test_query_blocked(query, "LOAD_FILE()")
+        )
+        info = _classify_query.cache_info()
+        self.assertEqual(info.misses, misses_after_first)
+        self.assertGreaterEqual(info.hits, 1)
+
     def test_comments_removed_before_validation(self):
         """Test that comments are removed before validation."""
         queries = [
@@ -0,0 +1,136 @@
+"""
+Tests for MCP_MAX_RESULTS row-cap behaviour in _execute_query/execute_sql.
+
+Results under the cap come back whole; larger results are truncated and,
+on the execute_sql tool path, flagged with a trailing warning row. The
+fake unbuffered cursor enforces the real SSCursor contract: a second
+execute before the previous result is drained fails the test.
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncmy
+
+from server import MariaDBServer
+
+
+class _FakeProbeCursor:
+    """Buffered cursor stand-in for the DATABASE()/USE preamble."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+    async def execute(self, sql, params=None):
+        pass
+
+    async def fetchone(self):
+        return {'DATABASE()': 'testdb'}
+
+
+class _FakeSSCursor:
+    """Unbuffered cursor stand-in serving a fixed row list.
+
+    Mirrors the contract that poisons real connections when violated: the
+    previous result must be drained (or the cursor closed) before the
+    connection takes another command.
+    """
+
+    def __init__(self, rows):
+        self._rows = list(rows)
+        self._active = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        # close() drains the unfetched remainder on a real SSCursor.
+        self._rows = []
+        self._active = False
+        return None
+
+    async def execute(self, sql, params=None):
+        if self._active:
+            raise AssertionError("Previous unbuffered result was left incomplete")
+        self._active = True
+
+    async def fetchone(self):
+        if not self._rows:
+            self._active = False
+            return None
+        return self._rows.pop(0)
+
+    async def fetchmany(self, size):
+        batch = self._rows[:size]
+        del self._rows[:size]
+        if not batch:
+            self._active = False
+        return batch
+
+
+class TestResultTruncation(unittest.IsolatedAsyncioTestCase):
+
+    def _make_server(self, rows):
+        server = MariaDBServer(server_name="TestServer")
+
+        def make_cursor(cursor=None):
+            if cursor is asyncmy.cursors.SSDictCursor:
+                return _FakeSSCursor(rows)
+            return _FakeProbeCursor()
+
+        conn = MagicMock()
+        conn.__aenter__ = AsyncMock(return_value=conn)
+        conn.__aexit__ = AsyncMock(return_value=None)
+        conn.cursor = MagicMock(side_effect=make_cursor)
+
+        acquire_cm = MagicMock()
+        acquire_cm.__aenter__ = AsyncMock(return_value=conn)
+        acquire_cm.__aexit__ = AsyncMock(return_value=None)
+
+        pool = MagicMock()
+        pool.acquire = MagicMock(return_value=acquire_cm)
+        server.pool = pool
+        return server
+
+    @staticmethod
+    def _rows(n):
+        return [{'id': i} for i in range(n)]
+
+    async def test_under_cap_returned_whole(self):
+        server = self._make_server(self._rows(3))
+        with patch("server.MCP_MAX_RESULTS", 5):
+            results = await server.execute_sql("SELECT id FROM t", "")
+        self.assertEqual(results, self._rows(3))
+
+    async def test_exactly_at_cap_not_flagged(self):
+        server = self._make_server(self._rows(5))
+        with patch("server.MCP_MAX_RESULTS", 5):
+            results = await server.execute_sql("SELECT id FROM t", "")
+        # All rows fit: no truncation and no warning row.
+        self.assertEqual(results, self._rows(5))
+
+    async def test_over_cap_truncated_and_flagged(self):
+        server = self._make_server(self._rows(7))
+        with patch("server.MCP_MAX_RESULTS", 5):
+            results = await server.execute_sql("SELECT id FROM t", "")
+        self.assertEqual(results[:5], self._rows(5))
+        self.assertEqual(len(results), 6)
+        self.assertIn("truncated", results[5]["warning"])
+
+    async def test_internal_callers_get_no_warning_row(self):
+        server = self._make_server(self._rows(7))
+        with patch("server.MCP_MAX_RESULTS", 5):
+            results = await server._execute_query("SELECT id FROM t")
+        self.assertEqual(results, self._rows(5))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)